@@ -0,0 +1,74 @@
+"""Numba kernels for the in-process aggregation fallback.
+
+Optional: only imported when numba is installed (pip install "akron[numba]").
+Groups are formed with a stable sort followed by a segment scan, and each
+segment is reduced in parallel. NULL values are passed in as NaN and skipped,
+matching SQL aggregate semantics.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _segment_starts(sorted_keys):
+    n = sorted_keys.size
+    starts = np.empty(n + 1, np.int64)
+    groups = 0
+    for i in range(n):
+        if i == 0 or sorted_keys[i] != sorted_keys[i - 1]:
+            starts[groups] = i
+            groups += 1
+    starts[groups] = n
+    return starts[:groups + 1]
+
+
+@njit(parallel=True, cache=True)
+def _segment_reduce(values, starts):
+    n_groups = starts.size - 1
+    counts = np.zeros(n_groups, np.int64)
+    sums = np.zeros(n_groups, np.float64)
+    mins = np.full(n_groups, np.nan)
+    maxs = np.full(n_groups, np.nan)
+    for g in prange(n_groups):
+        count = 0
+        total = 0.0
+        lo = np.inf
+        hi = -np.inf
+        for i in range(starts[g], starts[g + 1]):
+            v = values[i]
+            if not np.isnan(v):
+                count += 1
+                total += v
+                if v < lo:
+                    lo = v
+                if v > hi:
+                    hi = v
+        counts[g] = count
+        sums[g] = total
+        if count:
+            mins[g] = lo
+            maxs[g] = hi
+    return counts, sums, mins, maxs
+
+
+def group_reduce(keys, columns):
+    """
+    Group float64 columns by int64 keys.
+
+    Returns (unique_keys, row_counts, reductions) where reductions holds one
+    (counts, sums, mins, maxs) tuple of arrays per input column; counts are
+    the non-NULL values per group, row_counts the rows per group.
+    """
+    order = np.argsort(keys, kind="mergesort")
+    sorted_keys = keys[order]
+    starts = _segment_starts(sorted_keys)
+    unique_keys = sorted_keys[starts[:-1]]
+    row_counts = np.diff(starts)
+    return unique_keys, row_counts, [_segment_reduce(column[order], starts) for column in columns]
+
+
+def group_sum_count(keys, values):
+    """Return (unique_keys, sums, counts) of values grouped by keys."""
+    unique_keys, _, ((counts, sums, _, _),) = group_reduce(keys, [values])
+    return unique_keys, sums, counts
@@ -0,0 +1,180 @@
+"""In-process aggregation helpers for drivers that cannot push work to SQL."""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..utils import parse_aggregate
+
+# Below this many rows the JIT dispatch and array copies cost more than the
+# Python loop they replace
+NUMBA_MIN_ROWS = 10000
+
+_numba_kernels = None
+
+
+def _load_numba():
+    """Import the optional numba kernels once; None when numba is unavailable."""
+    global _numba_kernels
+    if _numba_kernels is None:
+        try:
+            from . import _agg_numba
+            _numba_kernels = _agg_numba
+        except ImportError:
+            _numba_kernels = False
+    return _numba_kernels or None
+
+
+def _new_state() -> List[Any]:
+    # [non-null value count, running total, min, max]
+    return [0, 0, None, None]
+
+
+def _accumulate(state: List[Any], func: str, value: Any) -> None:
+    if value is None:
+        return
+    state[0] += 1
+    if func in ("sum", "avg"):
+        state[1] += value
+    elif func == "min":
+        state[2] = value if state[2] is None or value < state[2] else state[2]
+    elif func == "max":
+        state[3] = value if state[3] is None or value > state[3] else state[3]
+
+
+def _merge(state: List[Any], func: str, other: List[Any]) -> None:
+    if not other[0]:
+        return
+    state[0] += other[0]
+    if func in ("sum", "avg"):
+        state[1] += other[1]
+    elif func == "min":
+        state[2] = other[2] if state[2] is None or other[2] < state[2] else state[2]
+    elif func == "max":
+        state[3] = other[3] if state[3] is None or other[3] > state[3] else state[3]
+
+
+def _finalize(state: List[Any], func: str) -> Any:
+    count = state[0]
+    if func == "count":
+        return count
+    if not count:
+        return None
+    if func == "sum":
+        return state[1]
+    if func == "avg":
+        return state[1] / count
+    return state[2] if func == "min" else state[3]
+
+
+def _build_partials(rows: List[Dict[str, Any]], key: str,
+                    specs: List[Tuple[str, str, Optional[str]]]) -> Dict[Any, List[List[Any]]]:
+    """Partial aggregate states of rows grouped by key (NULL keys are skipped)."""
+    if len(rows) >= NUMBA_MIN_ROWS:
+        partials = _build_partials_numba(rows, key, specs)
+        if partials is not None:
+            return partials
+
+    partials: Dict[Any, List[List[Any]]] = {}
+    for row in rows:
+        key_value = row[key]
+        if key_value is None:
+            continue
+        partial = partials.get(key_value)
+        if partial is None:
+            partial = partials[key_value] = [_new_state() for _ in specs]
+        for state, (_, func, column) in zip(partial, specs):
+            _accumulate(state, func, key_value if column is None else row[column])
+    return partials
+
+
+def _build_partials_numba(rows: List[Dict[str, Any]], key: str,
+                          specs: List[Tuple[str, str, Optional[str]]]) -> Optional[Dict[Any, List[List[Any]]]]:
+    """
+    Vectorized _build_partials using the numba kernels.
+
+    Returns None (use the Python loop) when numba is missing or the key or
+    value columns are not plain numbers.
+    """
+    kernels = _load_numba()
+    if kernels is None:
+        return None
+    import numpy as np
+
+    keyed = [row for row in rows if row[key] is not None]
+    keys = [row[key] for row in keyed]
+    if not all(type(k) is int for k in keys):
+        return None
+    columns = sorted({column for _, _, column in specs if column is not None})
+    arrays, all_ints = [], {}
+    for column in columns:
+        values = [row[column] for row in keyed]
+        if not all(v is None or type(v) in (int, float, bool) for v in values):
+            return None
+        all_ints[column] = all(v is None or type(v) is not float for v in values)
+        if all_ints[column] and max((abs(v) for v in values if v is not None), default=0) * len(values) >= 2 ** 53:
+            return None  # integer sums could lose precision in float64
+        arrays.append(np.fromiter((np.nan if v is None else v for v in values),
+                                  dtype=np.float64, count=len(values)))
+
+    unique_keys, row_counts, reductions = kernels.group_reduce(
+        np.fromiter(keys, dtype=np.int64, count=len(keys)), arrays)
+    by_column = dict(zip(columns, reductions))
+
+    partials: Dict[Any, List[List[Any]]] = {}
+    for g, key_value in enumerate(unique_keys.tolist()):
+        partial = []
+        for _, func, column in specs:
+            if column is None:
+                partial.append([int(row_counts[g]), 0, None, None])
+                continue
+            counts, sums, mins, maxs = by_column[column]
+            count = int(counts[g])
+            cast = int if all_ints[column] else float
+            state = [count, cast(sums[g]), None, None]
+            if count:
+                state[2], state[3] = cast(mins[g]), cast(maxs[g])
+            partial.append(state)
+        partials[key_value] = partial
+    return partials
+
+
+def hash_join_aggregate(left_rows: Iterable[Dict[str, Any]], right_rows: Iterable[Dict[str, Any]],
+                        on: Tuple[str, str], aggregations: Dict[str, str],
+                        group_by: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    LEFT JOIN right_rows onto left_rows and aggregate per group, in O(N + M).
+
+    The right relation is scanned once into a dict of partial aggregates keyed
+    by the join column; each left row then probes it with a single lookup.
+    Aggregations use the same specs as Akron.aggregate ('count', 'sum(col)',
+    ...) and follow SQL semantics: NULLs are ignored and 'count' counts the
+    matched right rows, so unmatched left rows report 0.
+
+    With numba installed, the build side of large numeric inputs runs in a
+    compiled sort + segment-scan kernel (see _agg_numba).
+    """
+    left_key, right_key = on
+    specs = [(alias,) + parse_aggregate(spec) for alias, spec in aggregations.items()]
+    group_by = list(group_by or [left_key])
+
+    # Build side: partial aggregates of the right relation per join key
+    # (vectorized with numba for large numeric inputs when it is installed)
+    probe = _build_partials(list(right_rows), right_key, specs)
+
+    # Probe side: one dict lookup per left row, folded into its output group
+    groups: Dict[Tuple, Tuple[Dict[str, Any], List[List[Any]]]] = {}
+    for row in left_rows:
+        group_key = tuple(row[c] for c in group_by)
+        group = groups.get(group_key)
+        if group is None:
+            group = groups[group_key] = (dict(zip(group_by, group_key)), [_new_state() for _ in specs])
+        partial = probe.get(row[left_key])
+        if partial is not None:
+            for state, other, (_, func, _) in zip(group[1], partial, specs):
+                _merge(state, func, other)
+
+    results = []
+    for record, states in groups.values():
+        for state, (alias, func, _) in zip(states, specs):
+            record[alias] = _finalize(state, func)
+        results.append(record)
+    return results
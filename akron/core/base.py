@@ -1,7 +1,9 @@
 """Abstract base driver for akron drivers."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Union
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional, List, Tuple, Union
+from .aggregation import hash_join_aggregate
 
 
 class QueryBuilder:
@@ -73,14 +75,31 @@ class BaseDriver(ABC):
     def create_table(self, table_name: str, schema: Dict[str, str]) -> None:
         raise NotImplementedError
 
+    def create_schema(self, tables: Dict[str, Dict[str, str]],
+                      indexes: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Create several tables and indexes. Drivers may override to batch the DDL."""
+        for table_name, schema in tables.items():
+            self.create_table(table_name, schema)
+        for index in indexes or []:
+            columns = index["columns"]
+            if isinstance(columns, str):
+                columns = [columns]
+            self.create_index(index["table"], columns, index.get("unique", False))
+
     @abstractmethod
     def insert(self, table_name: str, data: Dict[str, Any]) -> int:
         raise NotImplementedError
         
     @abstractmethod
-    def bulk_insert(self, table_name: str, data_list: List[Dict[str, Any]]) -> List[int]:
+    def bulk_insert(self, table_name: str, data_list: List[Dict[str, Any]],
+                    bulk_size: Optional[int] = None, commit_size: Optional[int] = None) -> List[int]:
         raise NotImplementedError
 
+    def bulk_load(self, table_name: str, data_list: List[Dict[str, Any]],
+                  drop_indexes: bool = True, bulk_size: Optional[int] = None) -> List[int]:
+        """Load a large batch of rows. Drivers may rebuild indexes around the load."""
+        return self.bulk_insert(table_name, data_list, bulk_size)
+
     @abstractmethod
     def find(self, table_name: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         raise NotImplementedError
@@ -89,6 +108,14 @@ class BaseDriver(ABC):
     def query(self, table_name: str, builder: QueryBuilder) -> List[Dict[str, Any]]:
         raise NotImplementedError
 
+    def query_count(self, table_name: str, builder: QueryBuilder) -> int:
+        """Count the rows a QueryBuilder would return. Drivers may override to count in SQL."""
+        return len(self.query(table_name, builder))
+
+    def explain_cached(self, table_name: str, builder: QueryBuilder) -> Optional[str]:
+        """Return the cached SQL for a builder. Drivers without a query cache return None."""
+        return None
+
     @abstractmethod
     def update(self, table_name: str, filters: Dict[str, Any], new_values: Dict[str, Any]) -> int:
         raise NotImplementedError
@@ -97,6 +124,10 @@ class BaseDriver(ABC):
     def bulk_update(self, table_name: str, updates: List[Dict[str, Any]]) -> int:
         raise NotImplementedError
 
+    def bulk_delete(self, table_name: str, filters_list: List[Dict[str, Any]]) -> int:
+        """Delete the rows matching each filters dict. Drivers may override to batch the statements."""
+        return sum(self.delete(table_name, filters) for filters in filters_list)
+
     @abstractmethod
     def delete(self, table_name: str, filters: Dict[str, Any]) -> int:
         raise NotImplementedError
@@ -105,16 +136,68 @@ class BaseDriver(ABC):
     def count(self, table_name: str, filters: Optional[Dict[str, Any]] = None) -> int:
         raise NotImplementedError
         
+    def count_many(self, specs: Dict[str, Tuple[str, Optional[Dict[str, Any]]]]) -> Dict[str, int]:
+        """Count several (table_name, filters) specs. Drivers may override to use one statement."""
+        return {name: self.count(table_name, filters) for name, (table_name, filters) in specs.items()}
+
+    def exists(self, table_name: str, filters: Dict[str, Any]) -> bool:
+        """Check if any record matches filters. Drivers may override with a LIMIT 1 probe."""
+        return self.count(table_name, filters) > 0
+
+    def get_or_create(self, table_name: str, filters: Dict[str, Any],
+                      defaults: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], bool]:
+        """Return (record, created), inserting filters + defaults when nothing matches."""
+        records = self.find(table_name, filters)
+        if records:
+            return records[0], False
+        
+        # Create new record
+        create_data = {**filters}
+        if defaults:
+            create_data.update(defaults)
+        
+        record_id = self.insert(table_name, create_data)
+        return self.find(table_name, {"id": record_id})[0], True
+
+    def upsert(self, table_name: str, filters: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+        """Update the records matching filters, or insert filters + values if none match."""
+        if self.exists(table_name, filters):
+            self.update(table_name, filters, values)
+            return self.find(table_name, filters)[0]
+        create_data = {**filters, **values}
+        record_id = self.insert(table_name, create_data)
+        return self.find(table_name, {"id": record_id})[0]
+
     @abstractmethod
     def aggregate(self, table_name: str, aggregations: Dict[str, str], 
                   filters: Optional[Dict[str, Any]] = None, 
                   group_by: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         raise NotImplementedError
         
+    def join_aggregate(self, left_table: str, right_table: str, on: Tuple[str, str],
+                       aggregations: Dict[str, str],
+                       group_by: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Aggregate right_table rows per left_table group (LEFT JOIN ... GROUP BY).
+
+        Generic version: both tables are fetched and joined in-process with a
+        hash join, O(N + M). SQL drivers should override this to push the join
+        and the aggregation down to the database.
+        """
+        return hash_join_aggregate(self.find(left_table), self.find(right_table),
+                                   on, aggregations, group_by)
+
     @abstractmethod
     def raw_sql(self, sql: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         raise NotImplementedError
+
+    def raw_iter(self, sql: str, params: Optional[tuple] = None, chunk: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Iterate over raw SQL results. Drivers may override to fetch in chunks of ``chunk`` rows."""
+        return iter(self.raw_sql(sql, params))
         
+    def pragma(self, name: str, value: Any = None) -> List[Dict[str, Any]]:
+        raise NotImplementedError(f"{type(self).__name__} does not support PRAGMA statements")
+
     @abstractmethod
     def begin_transaction(self) -> None:
         raise NotImplementedError
@@ -126,6 +209,11 @@ class BaseDriver(ABC):
     @abstractmethod
     def rollback_transaction(self) -> None:
         raise NotImplementedError
+
+    @contextmanager
+    def nested_transaction(self):
+        """Scope for a transaction opened inside another. Drivers with savepoints make it atomic."""
+        yield
         
     @abstractmethod
     def create_index(self, table_name: str, columns: List[str], unique: bool = False) -> None:
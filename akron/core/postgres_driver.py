@@ -5,6 +5,7 @@ from psycopg2.extras import RealDictCursor
 from typing import Dict, Any, Optional, List, Tuple
 from ..core.base import BaseDriver
 from ..exceptions import AkronError, TableNotFoundError
+from ..utils import parse_type_spec
 
 class PostgresDriver(BaseDriver):
     def __init__(self, db_url: str):
@@ -29,10 +30,10 @@ class PostgresDriver(BaseDriver):
         fks = []
         for col, dtype in schema.items():
             # Foreign key syntax: 'type->table.column'
-            if isinstance(dtype, str) and "->" in dtype:
-                base_type, fk = dtype.split("->", 1)
-                sql_type = "INTEGER" if base_type.strip() == "int" else "VARCHAR(255)" if base_type.strip() == "str" else base_type.strip().upper()
-                ref_table, ref_col = fk.strip().split(".")
+            base_type, fk = parse_type_spec(dtype)
+            if fk:
+                sql_type = "INTEGER" if base_type == "int" else "VARCHAR(255)" if base_type == "str" else base_type.upper()
+                ref_table, ref_col = fk
                 cols.append(f"{col} {sql_type}")
                 fks.append(f"FOREIGN KEY({col}) REFERENCES {ref_table}({ref_col})")
             else:
@@ -1,16 +1,67 @@
 """SQLite driver for akron."""
 
+import functools
+import operator
 import sqlite3
 import json
-from typing import Dict, Any, Optional, List, Tuple, Union
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, Iterator, Optional, List, Tuple, Union
 from .base import BaseDriver, QueryBuilder
-from ..utils import map_type, sanitize_identifier
+from ..utils import map_type, sanitize_identifier, parse_aggregate, parse_type_spec
 from ..exceptions import AkronError, TableNotFoundError
 
 
+@functools.lru_cache(maxsize=256)
+def _schema_to_sql(table_name: str, schema_items: Tuple[Tuple[str, Any], ...]) -> str:
+    """
+    Build CREATE TABLE SQL from (column, type spec) pairs.
+
+    Memoized: structurally identical schemas (repeated create_table calls,
+    test setups, create_schema) are translated once. Items keep their
+    declared order since it defines the column layout.
+    """
+    tname = sanitize_identifier(table_name)
+    cols = []
+    fks = []
+    for col, dtype in schema_items:
+        cname = sanitize_identifier(col)
+        # FK syntax: 'type->table.column'
+        base_type, fk = parse_type_spec(dtype)
+        sql_type = map_type(base_type)
+        if fk:
+            ref_table, ref_col = fk
+            cols.append(f"{cname} {sql_type}")
+            fks.append(f"FOREIGN KEY({cname}) REFERENCES {ref_table}({ref_col})")
+        else:
+            if cname == "id" and sql_type.upper() == "INTEGER":
+                cols.append(f"{cname} {sql_type} PRIMARY KEY AUTOINCREMENT")
+            else:
+                cols.append(f"{cname} {sql_type}")
+    cols_sql = ", ".join(cols + fks)
+    return f"CREATE TABLE IF NOT EXISTS {tname} ({cols_sql})"
+
+
 class SQLiteDriver(BaseDriver):
-    def __init__(self, db_url: str):
-        """db_url format: sqlite:///path/to/db or sqlite:///:memory:"""
+    # Maximum number of entries kept in each generated-SQL cache
+    # (QueryBuilder shapes, WHERE clauses, INSERT statements)
+    _QUERY_CACHE_SIZE = 256
+    # Executions of one query shape before it gets a specialized function
+    _HOT_THRESHOLD = 32
+    # INSERT ... RETURNING needs SQLite 3.35+
+    _SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+    def __init__(self, db_url: str, stmt_cache_size: int = 128, dict_rows: bool = False,
+                 fast: bool = False):
+        """
+        db_url format: sqlite:///path/to/db or sqlite:///:memory:
+
+        stmt_cache_size sets how many prepared statements the connection keeps,
+        keyed by SQL text, so repeated CRUD calls skip SQLite's parser.
+        find/query/raw_sql return sqlite3.Row objects (tuple-backed, shared
+        column index, row["name"] access) unless dict_rows is True.
+        fast=True switches to WAL journaling with synchronous=NORMAL and
+        enlarges the page cache and memory map (see _apply_fast_pragmas).
+        """
         if not db_url.startswith("sqlite://"):
             raise AkronError("SQLiteDriver requires sqlite:// URL")
         # support sqlite:///file.db and sqlite:///:memory:
@@ -21,23 +72,92 @@ class SQLiteDriver(BaseDriver):
         # handle in-memory database for both ':memory:' and '/:memory:'
         if path in (":memory:", "/:memory:"):
             self._path = ":memory:"
-            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self.conn = sqlite3.connect(":memory:", check_same_thread=False,
+                                        cached_statements=stmt_cache_size)
         else:
             self._path = path
-            self.conn = sqlite3.connect(self._path, check_same_thread=False)
+            self.conn = sqlite3.connect(self._path, check_same_thread=False,
+                                        cached_statements=stmt_cache_size)
         self.conn.row_factory = sqlite3.Row
         self.cur = self.conn.cursor()
+        self.dict_rows = dict_rows
+        if fast:
+            self._apply_fast_pragmas()
+        self._query_cache: Dict[tuple, str] = {}
+        self._hit_count: Dict[tuple, int] = {}
+        self._compiled: Dict[tuple, Any] = {}
+        self._where_cache: Dict[Tuple[str, ...], str] = {}
+        self._insert_cache: Dict[Tuple[str, Tuple[str, ...]], str] = {}
 
-    def _exec(self, sql: str, params: Tuple = ()):
+    def _apply_fast_pragmas(self) -> None:
+        # WAL + NORMAL syncs the log only at checkpoints instead of on every
+        # COMMIT; a power loss may drop the last commits but never corrupts
+        self.cur.execute("PRAGMA journal_mode=WAL")
+        self.cur.execute("PRAGMA synchronous=NORMAL")
+        # Keep temp b-trees (index builds, sorts) in RAM, cache up to 64 MiB
+        # of pages instead of ~2 MiB and read through a 256 MiB memory map;
+        # these cost memory, not durability
+        self.cur.execute("PRAGMA temp_store=MEMORY")
+        self.cur.execute("PRAGMA cache_size=-65536")
+        self.cur.execute("PRAGMA mmap_size=268435456")
+
+    def _write(self, sql: str, params: Tuple = ()):
+        """
+        Execute one write statement in its own transaction, unless a
+        transaction is already open; then the statement joins it and the
+        caller's COMMIT (one fsync for the whole batch) persists it.
+        """
+        owns_transaction = not self.conn.in_transaction
         try:
             self.cur.execute(sql, params)
+        except sqlite3.Error:
+            if owns_transaction and self.conn.in_transaction:
+                self.conn.rollback()
+            raise
+        if owns_transaction:
             self.conn.commit()
-        except sqlite3.OperationalError as e:
-            # common: no such table
-            msg = str(e).lower()
-            if "no such table" in msg:
-                raise TableNotFoundError(msg)
-            raise AkronError(str(e))
+
+    @contextmanager
+    def _savepoint(self, name: str):
+        """
+        Make the enclosed statements atomic inside the caller's open
+        transaction: on error only they are undone, and the exception
+        propagates with the outer transaction still usable.
+        """
+        self.cur.execute(f"SAVEPOINT {name}")
+        try:
+            yield
+        except BaseException:
+            # a failed COMMIT-level error may already have ended the transaction
+            if self.conn.in_transaction:
+                self.cur.execute(f"ROLLBACK TO {name}")
+                self.cur.execute(f"RELEASE {name}")
+            raise
+        self.cur.execute(f"RELEASE {name}")
+
+    def _table_sql(self, table_name: str, schema: Dict[str, str]) -> str:
+        """Translate an Akron schema dict into a CREATE TABLE statement."""
+        if not schema or not isinstance(schema, dict):
+            raise AkronError("schema must be a non-empty dict")
+        items = tuple(schema.items())
+        try:
+            return _schema_to_sql(table_name, items)
+        except TypeError:
+            # the cache key (and map_type) need hashable specs like "int"
+            raise AkronError(f"Column types must be strings such as 'int' or 'int->users.id': {schema!r}")
+
+    def _exec_script(self, sql: str, error_prefix: str = ""):
+        """Run one-shot DDL outside the statement cache, or in the caller's open transaction."""
+        try:
+            if self.conn.in_transaction:
+                self.cur.execute(sql)
+            else:
+                self.conn.executescript(sql)
+        except sqlite3.Error as e:
+            msg = str(e)
+            if isinstance(e, sqlite3.OperationalError) and "no such table" in msg.lower():
+                raise TableNotFoundError(msg.lower())
+            raise AkronError(error_prefix + msg)
 
     def create_table(self, table_name: str, schema: Dict[str, str]) -> None:
         """
@@ -45,45 +165,68 @@ class SQLiteDriver(BaseDriver):
         Foreign key syntax: 'type->table.column'
         Example: {"user_id": "int->users.id"}
         """
-        if not schema or not isinstance(schema, dict):
-            raise AkronError("schema must be a non-empty dict")
+        self._exec_script(self._table_sql(table_name, schema))
 
-        tname = sanitize_identifier(table_name)
-        cols = []
-        fks = []
-        for col, dtype in schema.items():
-            cname = sanitize_identifier(col)
-            # Check for FK syntax
-            if isinstance(dtype, str) and "->" in dtype:
-                base_type, fk = dtype.split("->", 1)
-                sql_type = map_type(base_type.strip())
-                ref_table, ref_col = fk.strip().split(".")
-                ref_table = sanitize_identifier(ref_table)
-                ref_col = sanitize_identifier(ref_col)
-                cols.append(f"{cname} {sql_type}")
-                fks.append(f"FOREIGN KEY({cname}) REFERENCES {ref_table}({ref_col})")
+    def create_schema(self, tables: Dict[str, Dict[str, str]],
+                      indexes: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Create several tables and indexes as a single DDL script.
+
+        All statements are joined into one script and executed inside a
+        single BEGIN/COMMIT, so SQLite parses the batch once and syncs once.
+        """
+        if not tables or not isinstance(tables, dict):
+            raise AkronError("tables must be a non-empty dict")
+
+        statements = [self._table_sql(name, schema) for name, schema in tables.items()]
+        for index in indexes or []:
+            if not isinstance(index, dict) or "table" not in index or "columns" not in index:
+                raise AkronError("Each index must be a dict with 'table' and 'columns' keys")
+            columns = index["columns"]
+            if isinstance(columns, str):
+                columns = [columns]
+            statements.append(self._index_sql(index["table"], columns, index.get("unique", False)))
+
+        owns_transaction = not self.conn.in_transaction
+        try:
+            if owns_transaction:
+                self.conn.executescript("BEGIN;\n" + ";\n".join(statements) + ";\nCOMMIT;")
             else:
-                sql_type = map_type(dtype)
-                if cname == "id" and sql_type.upper() == "INTEGER":
-                    cols.append(f"{cname} {sql_type} PRIMARY KEY AUTOINCREMENT")
-                else:
-                    cols.append(f"{cname} {sql_type}")
-        cols_sql = ", ".join(cols + fks)
-        sql = f"CREATE TABLE IF NOT EXISTS {tname} ({cols_sql})"
-        self._exec(sql)
+                # executescript() would commit the caller's open transaction;
+                # a savepoint undoes a partial schema without touching it
+                with self._savepoint("create_schema"):
+                    for sql in statements:
+                        self.cur.execute(sql)
+        except sqlite3.Error as e:
+            if owns_transaction and self.conn.in_transaction:
+                self.conn.rollback()
+            raise AkronError(f"Failed to create schema: {str(e)}")
+
+    def _insert_sql(self, table_name: str, columns: Tuple[str, ...]) -> str:
+        """
+        INSERT statement for a table and column tuple, generated once per shape.
+
+        Keyed by the columns in the caller's order so the values can be bound
+        straight from data.values() without re-ordering.
+        """
+        key = (table_name, columns)
+        sql = self._insert_cache.get(key)
+        if sql is None:
+            tname = sanitize_identifier(table_name)
+            keys = [sanitize_identifier(k) for k in columns]
+            placeholders = ", ".join(["?"] * len(keys))
+            cols_sql = ", ".join(keys)
+            sql = f"INSERT INTO {tname} ({cols_sql}) VALUES ({placeholders})"
+            self._cache_put(self._insert_cache, key, sql)
+        return sql
 
     def insert(self, table_name: str, data: Dict[str, Any]) -> int:
         if not data or not isinstance(data, dict):
             raise AkronError("data must be a non-empty dict")
-        tname = sanitize_identifier(table_name)
-        keys = [sanitize_identifier(k) for k in data.keys()]
-        placeholders = ", ".join(["?"] * len(keys))
-        cols_sql = ", ".join(keys)
-        sql = f"INSERT INTO {tname} ({cols_sql}) VALUES ({placeholders})"
+        sql = self._insert_sql(table_name, tuple(data))
         params = tuple(data.values())
         try:
-            self.cur.execute(sql, params)
-            self.conn.commit()
+            self._write(sql, params)
         except sqlite3.IntegrityError as e:
             msg = str(e)
             if "UNIQUE constraint failed" in msg:
@@ -98,18 +241,50 @@ class SQLiteDriver(BaseDriver):
             raise AkronError(str(e))
         return self.cur.lastrowid
 
+    def _fetch_rows(self) -> List[Any]:
+        """Fetch the current result set as sqlite3.Row objects, or dicts if dict_rows is set."""
+        rows = self.cur.fetchall()
+        if self.dict_rows:
+            return [dict(row) for row in rows]
+        return rows
+
+    def _cache_put(self, cache: Dict[Any, str], key: Any, sql: str) -> None:
+        """Store generated SQL, evicting the oldest entry once the cache is full."""
+        if len(cache) >= self._QUERY_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[key] = sql
+
+    def _eq_where(self, filters: Dict[str, Any]) -> Tuple[str, Tuple]:
+        """
+        Build an equality WHERE clause for a filters dict.
+
+        Keys are sorted so every dict with the same keys yields the same SQL
+        string; the clause is memoized on that key tuple and only the params
+        are rebuilt per call.
+        """
+        if not isinstance(filters, dict):
+            raise AkronError("filters must be a dict")
+        keys = tuple(sorted(filters))
+        where = self._where_cache.get(keys)
+        if where is None:
+            where = " WHERE " + " AND ".join(f"{sanitize_identifier(k)} = ?" for k in keys)
+            self._cache_put(self._where_cache, keys, where)
+        return where, tuple(filters[k] for k in keys)
+
+    @staticmethod
+    def _has_lookups(filters: Optional[Dict[str, Any]]) -> bool:
+        """True when filters use QueryBuilder operators such as age__lt."""
+        return bool(filters) and isinstance(filters, dict) and any("__" in k for k in filters)
+
     def find(self, table_name: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        if self._has_lookups(filters):
+            return self.query(table_name, QueryBuilder().where(**filters))
         tname = sanitize_identifier(table_name)
         sql = f"SELECT * FROM {tname}"
         params: Tuple = ()
         if filters:
-            if not isinstance(filters, dict):
-                raise AkronError("filters must be a dict")
-            conds = []
-            for k in filters.keys():
-                conds.append(f"{sanitize_identifier(k)} = ?")
-            sql += " WHERE " + " AND ".join(conds)
-            params = tuple(filters.values())
+            where, params = self._eq_where(filters)
+            sql += where
 
         try:
             self.cur.execute(sql, params)
@@ -119,9 +294,7 @@ class SQLiteDriver(BaseDriver):
                 raise TableNotFoundError(msg)
             raise AkronError(str(e))
 
-        columns = [d[0] for d in self.cur.description] if self.cur.description else []
-        rows = self.cur.fetchall()
-        return [dict(zip(columns, row)) for row in rows]
+        return self._fetch_rows()
 
     def update(self, table_name: str, filters: Dict[str, Any], new_values: Dict[str, Any]) -> int:
         if not filters or not isinstance(filters, dict):
@@ -130,12 +303,11 @@ class SQLiteDriver(BaseDriver):
             raise AkronError("new_values must be a non-empty dict for update")
         tname = sanitize_identifier(table_name)
         set_clause = ", ".join(f"{sanitize_identifier(k)} = ?" for k in new_values.keys())
-        where_clause = " AND ".join(f"{sanitize_identifier(k)} = ?" for k in filters.keys())
-        sql = f"UPDATE {tname} SET {set_clause} WHERE {where_clause}"
-        params = tuple(new_values.values()) + tuple(filters.values())
+        where, where_params = self._eq_where(filters)
+        sql = f"UPDATE {tname} SET {set_clause}{where}"
+        params = tuple(new_values.values()) + where_params
         try:
-            self.cur.execute(sql, params)
-            self.conn.commit()
+            self._write(sql, params)
         except sqlite3.OperationalError as e:
             msg = str(e).lower()
             if "no such table" in msg:
@@ -147,12 +319,10 @@ class SQLiteDriver(BaseDriver):
         if not filters or not isinstance(filters, dict):
             raise AkronError("filters must be a non-empty dict for delete")
         tname = sanitize_identifier(table_name)
-        where_clause = " AND ".join(f"{sanitize_identifier(k)} = ?" for k in filters.keys())
-        sql = f"DELETE FROM {tname} WHERE {where_clause}"
-        params = tuple(filters.values())
+        where, params = self._eq_where(filters)
+        sql = f"DELETE FROM {tname}{where}"
         try:
-            self.cur.execute(sql, params)
-            self.conn.commit()
+            self._write(sql, params)
         except sqlite3.OperationalError as e:
             msg = str(e).lower()
             if "no such table" in msg:
@@ -160,36 +330,44 @@ class SQLiteDriver(BaseDriver):
             raise AkronError(str(e))
         return self.cur.rowcount
 
-    def bulk_insert(self, table_name: str, data_list: List[Dict[str, Any]]) -> List[int]:
-        """Insert multiple records efficiently."""
-        if not data_list or not isinstance(data_list, list):
-            raise AkronError("data_list must be a non-empty list")
-        
-        if not all(isinstance(item, dict) for item in data_list):
-            raise AkronError("All items in data_list must be dictionaries")
-        
-        # Use the first record to determine columns
-        first_record = data_list[0]
+    def _write_returning(self, sql: str, params: Tuple = ()) -> List[Any]:
+        """Like _write, for statements with a RETURNING clause; rows are read before COMMIT."""
+        owns_transaction = not self.conn.in_transaction
+        try:
+            self.cur.execute(sql, params)
+            rows = self._fetch_rows()
+        except sqlite3.Error:
+            if owns_transaction and self.conn.in_transaction:
+                self.conn.rollback()
+            raise
+        if owns_transaction:
+            self.conn.commit()
+        return rows
+
+    def _insert_on_conflict(self, table_name: str, data: Dict[str, Any],
+                            conflict_keys: List[str], update_keys: List[str]) -> Optional[List[Any]]:
+        """
+        INSERT ... ON CONFLICT DO UPDATE/NOTHING RETURNING *; None means fall back to SELECT + write.
+        Every conflict burns one AUTOINCREMENT id (see FEATURES.md).
+        """
+        if not self._SUPPORTS_RETURNING:
+            return None
         tname = sanitize_identifier(table_name)
-        keys = [sanitize_identifier(k) for k in first_record.keys()]
+        keys = [sanitize_identifier(k) for k in data.keys()]
         placeholders = ", ".join(["?"] * len(keys))
-        cols_sql = ", ".join(keys)
-        sql = f"INSERT INTO {tname} ({cols_sql}) VALUES ({placeholders})"
-        
-        inserted_ids = []
+        conflict = ", ".join(sanitize_identifier(k) for k in conflict_keys)
+        if update_keys:
+            assignments = ", ".join(f"{k} = excluded.{k}" for k in map(sanitize_identifier, update_keys))
+            action = f"DO UPDATE SET {assignments}"
+        else:
+            action = "DO NOTHING"
+        sql = (
+            f"INSERT INTO {tname} ({', '.join(keys)}) VALUES ({placeholders}) "
+            f"ON CONFLICT({conflict}) {action} RETURNING *"
+        )
         try:
-            for data in data_list:
-                # Ensure all records have the same keys
-                if set(data.keys()) != set(first_record.keys()):
-                    raise AkronError("All records must have the same keys for bulk insert")
-                
-                params = tuple(data[k] for k in first_record.keys())
-                self.cur.execute(sql, params)
-                inserted_ids.append(self.cur.lastrowid)
-            
-            self.conn.commit()
+            return self._write_returning(sql, tuple(data.values()))
         except sqlite3.IntegrityError as e:
-            self.conn.rollback()
             msg = str(e)
             if "UNIQUE constraint failed" in msg:
                 raise AkronError(f"Duplicate entry on unique field: {msg}")
@@ -197,16 +375,200 @@ class SQLiteDriver(BaseDriver):
                 raise AkronError(f"Foreign key constraint failed: {msg}")
             raise AkronError(msg)
         except sqlite3.OperationalError as e:
-            self.conn.rollback()
             msg = str(e).lower()
             if "no such table" in msg:
                 raise TableNotFoundError(msg)
+            if "on conflict clause does not match" in msg:
+                return None
             raise AkronError(str(e))
+
+    def get_or_create(self, table_name: str, filters: Dict[str, Any],
+                      defaults: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], bool]:
+        """Insert with ON CONFLICT DO NOTHING; SELECT the existing row only if nothing was inserted."""
+        if not filters or not isinstance(filters, dict):
+            raise AkronError("filters must be a non-empty dict for get_or_create")
+        create_data = {**filters, **(defaults or {})}
+        rows = self._insert_on_conflict(table_name, create_data, sorted(filters), [])
+        if rows is None:
+            return super().get_or_create(table_name, filters, defaults)
+        if rows:
+            return rows[0], True
+        return self.find(table_name, filters)[0], False
+
+    def upsert(self, table_name: str, filters: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert or update in one INSERT ... ON CONFLICT DO UPDATE ... RETURNING * statement."""
+        if not filters or not isinstance(filters, dict):
+            raise AkronError("filters must be a non-empty dict for upsert")
+        if not values or not isinstance(values, dict):
+            raise AkronError("values must be a non-empty dict for upsert")
+        rows = self._insert_on_conflict(table_name, {**filters, **values}, sorted(filters),
+                                        [k for k in values if k not in filters])
+        if rows is None:
+            return super().upsert(table_name, filters, values)
+        if rows:
+            return rows[0]
+        # values only repeat the filters: DO NOTHING returns no row on a hit
+        return self.find(table_name, filters)[0]
+
+    def bulk_insert(self, table_name: str, data_list: List[Dict[str, Any]],
+                    bulk_size: Optional[int] = None, commit_size: Optional[int] = None) -> List[int]:
+        """
+        Insert multiple records with a single prepared statement.
+
+        Rows are sent through executemany() in chunks of ``bulk_size`` and
+        committed every ``commit_size`` rows; both default to the whole list.
+        When a transaction is already open the caller owns BEGIN/COMMIT.
+        """
+        if not data_list or not isinstance(data_list, list):
+            raise AkronError("data_list must be a non-empty list")
+        
+        if not all(isinstance(item, dict) for item in data_list):
+            raise AkronError("All items in data_list must be dictionaries")
+
+        if (bulk_size is not None and bulk_size < 1) or (commit_size is not None and commit_size < 1):
+            raise AkronError("bulk_size and commit_size must be positive integers")
+        
+        # Use the first record to determine columns
+        first_record = data_list[0]
+        columns = list(first_record.keys())
+        if not columns:
+            raise AkronError("Records to bulk insert must have at least one column")
+        column_set = set(columns)
+        # keys views compare against the set directly, stopping at the first mismatch
+        if any(data.keys() != column_set for data in data_list):
+            raise AkronError("All records must have the same keys for bulk insert")
+
+        sql = self._insert_sql(table_name, tuple(columns))
+        # itemgetter pulls every column of a row in one C call
+        getter = operator.itemgetter(*columns)
+        if len(columns) == 1:
+            params = [(getter(data),) for data in data_list]
+        else:
+            params = [getter(data) for data in data_list]
+
+        bulk_size = bulk_size or len(params)
+        commit_size = commit_size or len(params)
+        owns_transaction = not self.conn.in_transaction
+        id_index = columns.index("id") if "id" in column_set else None
+        
+        inserted_ids = []
+        # inside the caller's transaction a failed load must undo only its own rows
+        scope = nullcontext() if owns_transaction else self._savepoint("bulk_insert")
+        try:
+            with scope:
+                for start in range(0, len(params), commit_size):
+                    if owns_transaction:
+                        self.cur.execute("BEGIN IMMEDIATE")
+                    batch = params[start:start + commit_size]
+                    for offset in range(0, len(batch), bulk_size):
+                        chunk = batch[offset:offset + bulk_size]
+                        given = None if id_index is None else [row[id_index] for row in chunk]
+                        if given is not None and None in given and any(i is not None for i in given):
+                            # explicit and auto-assigned ids mixed: rowids are not one range
+                            for row in chunk:
+                                self.cur.execute(sql, row)
+                                inserted_ids.append(self.cur.lastrowid)
+                            continue
+                        self.cur.executemany(sql, chunk)
+                        if given is not None and None not in given:
+                            inserted_ids.extend(given)
+                        else:
+                            # rowids of one executemany() under a write lock are consecutive
+                            last_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                            inserted_ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+                    if owns_transaction:
+                        self.conn.commit()
+        except sqlite3.Error as e:
+            # any failure (constraint, missing table, unbindable value) must
+            # not leave our BEGIN IMMEDIATE open for later writes to join
+            if owns_transaction and self.conn.in_transaction:
+                self.conn.rollback()
+            msg = str(e)
+            if isinstance(e, sqlite3.IntegrityError):
+                if "UNIQUE constraint failed" in msg:
+                    raise AkronError(f"Duplicate entry on unique field: {msg}")
+                if "FOREIGN KEY constraint failed" in msg:
+                    raise AkronError(f"Foreign key constraint failed: {msg}")
+            elif isinstance(e, sqlite3.OperationalError) and "no such table" in msg.lower():
+                raise TableNotFoundError(msg.lower())
+            raise AkronError(msg)
         
         return inserted_ids
 
-    def query(self, table_name: str, builder: QueryBuilder) -> List[Dict[str, Any]]:
-        """Execute advanced query with QueryBuilder."""
+    def _query_shape(self, table_name: str, builder: QueryBuilder) -> tuple:
+        """
+        Key identifying the SQL a builder compiles to, independent of bound values.
+
+        Only values that change the generated SQL are part of the key: the
+        length of ``__in`` lists and the truthiness of ``__isnull``.
+        """
+        filter_shape = []
+        for key, value in builder.filters.items():
+            if key.endswith("__in") and isinstance(value, (list, tuple)):
+                filter_shape.append((key, len(value)))
+            elif key.endswith("__isnull"):
+                filter_shape.append((key, bool(value)))
+            else:
+                filter_shape.append((key, None))
+        select_fields = tuple(builder.select_fields) if builder.select_fields else None
+        return (
+            table_name,
+            select_fields,
+            tuple(builder.joins),
+            tuple(filter_shape),
+            tuple(builder.group_by_fields),
+            tuple(builder.having_conditions.keys()),
+            tuple(builder.sorts),
+            builder.limit_count is not None,
+            builder.limit_count is not None and builder.offset_count > 0,
+        )
+
+    def _condition(self, key: str, value: Any) -> Tuple[str, List[Any]]:
+        """
+        Translate one filter (field=value, field__gt=value, ...) into SQL.
+
+        Returns the condition with placeholders and the values to bind.
+        """
+        if "__" not in key:
+            # Simple equality
+            return f"{sanitize_identifier(key)} = ?", [value]
+
+        # Handle advanced operators like field__gt, field__lt
+        field, operator = key.split("__", 1)
+        field = sanitize_identifier(field)
+        
+        if operator == "gt":
+            return f"{field} > ?", [value]
+        elif operator == "gte":
+            return f"{field} >= ?", [value]
+        elif operator == "lt":
+            return f"{field} < ?", [value]
+        elif operator == "lte":
+            return f"{field} <= ?", [value]
+        elif operator == "ne":
+            return f"{field} != ?", [value]
+        elif operator == "in":
+            if isinstance(value, (list, tuple)):
+                placeholders = ", ".join(["?"] * len(value))
+                return f"{field} IN ({placeholders})", list(value)
+            raise AkronError("Value for 'in' operator must be a list or tuple")
+        elif operator == "like":
+            return f"{field} LIKE ?", [value]
+        elif operator == "isnull":
+            if value:
+                return f"{field} IS NULL", []
+            return f"{field} IS NOT NULL", []
+        raise AkronError(f"Unknown operator: {operator}")
+
+    def _compile_query(self, table_name: str, builder: QueryBuilder,
+                       shape: Optional[tuple] = None) -> str:
+        """Return the SQL for a builder, building it only on a shape cache miss."""
+        if shape is None:
+            shape = self._query_shape(table_name, builder)
+        sql = self._query_cache.get(shape)
+        if sql is not None:
+            return sql
+
         tname = sanitize_identifier(table_name)
         
         # Build SELECT clause
@@ -220,7 +582,6 @@ class SQLiteDriver(BaseDriver):
             select_clause = "*"
         
         sql = f"SELECT {select_clause} FROM {tname}"
-        params = []
         
         # Build JOIN clauses
         for join_table, on_condition, join_type in builder.joins:
@@ -229,51 +590,8 @@ class SQLiteDriver(BaseDriver):
         
         # Build WHERE clause
         if builder.filters:
-            conditions = []
-            for key, value in builder.filters.items():
-                if "__" in key:
-                    # Handle advanced operators like field__gt, field__lt
-                    field, operator = key.split("__", 1)
-                    field = sanitize_identifier(field)
-                    
-                    if operator == "gt":
-                        conditions.append(f"{field} > ?")
-                    elif operator == "gte":
-                        conditions.append(f"{field} >= ?")
-                    elif operator == "lt":
-                        conditions.append(f"{field} < ?")
-                    elif operator == "lte":
-                        conditions.append(f"{field} <= ?")
-                    elif operator == "ne":
-                        conditions.append(f"{field} != ?")
-                    elif operator == "in":
-                        if isinstance(value, (list, tuple)):
-                            placeholders = ", ".join(["?"] * len(value))
-                            conditions.append(f"{field} IN ({placeholders})")
-                            params.extend(value)
-                            continue  # Skip adding value to params again
-                        else:
-                            raise AkronError("Value for 'in' operator must be a list or tuple")
-                    elif operator == "like":
-                        conditions.append(f"{field} LIKE ?")
-                    elif operator == "isnull":
-                        if value:
-                            conditions.append(f"{field} IS NULL")
-                        else:
-                            conditions.append(f"{field} IS NOT NULL")
-                        continue  # Skip adding value to params
-                    else:
-                        raise AkronError(f"Unknown operator: {operator}")
-                    
-                    params.append(value)
-                else:
-                    # Simple equality
-                    field = sanitize_identifier(key)
-                    conditions.append(f"{field} = ?")
-                    params.append(value)
-            
-            if conditions:
-                sql += " WHERE " + " AND ".join(conditions)
+            conditions = [self._condition(key, value)[0] for key, value in builder.filters.items()]
+            sql += " WHERE " + " AND ".join(conditions)
         
         # Build GROUP BY clause
         if builder.group_by_fields:
@@ -283,9 +601,8 @@ class SQLiteDriver(BaseDriver):
         # Build HAVING clause
         if builder.having_conditions:
             having_conditions = []
-            for key, value in builder.having_conditions.items():
+            for key in builder.having_conditions.keys():
                 having_conditions.append(f"{sanitize_identifier(key)} = ?")
-                params.append(value)
             sql += " HAVING " + " AND ".join(having_conditions)
         
         # Build ORDER BY clause
@@ -296,60 +613,286 @@ class SQLiteDriver(BaseDriver):
                 order_fields.append(f"{field_clean} {direction}")
             sql += " ORDER BY " + ", ".join(order_fields)
         
-        # Build LIMIT and OFFSET
+        # LIMIT and OFFSET are bound so every page reuses the same statement
         if builder.limit_count is not None:
-            sql += f" LIMIT {builder.limit_count}"
+            sql += " LIMIT ?"
             if builder.offset_count > 0:
-                sql += f" OFFSET {builder.offset_count}"
-        
-        # Execute query
+                sql += " OFFSET ?"
+
+        if len(self._query_cache) >= self._QUERY_CACHE_SIZE:
+            # evict the oldest shape (dicts keep insertion order)
+            oldest = next(iter(self._query_cache))
+            del self._query_cache[oldest]
+            self._hit_count.pop(oldest, None)
+            self._compiled.pop(oldest, None)
+        self._query_cache[shape] = sql
+        return sql
+
+    def _query_params(self, builder: QueryBuilder) -> Tuple:
+        """Collect bound values in the order _compile_query emits placeholders."""
+        params = []
+        for key, value in builder.filters.items():
+            if key.endswith("__isnull"):
+                continue
+            if key.endswith("__in"):
+                params.extend(value)
+            else:
+                params.append(value)
+        params.extend(builder.having_conditions.values())
+        if builder.limit_count is not None:
+            params.append(builder.limit_count)
+            if builder.offset_count > 0:
+                params.append(builder.offset_count)
+        return tuple(params)
+
+    def _specialize(self, shape: tuple, sql: str):
+        """
+        Generate a query function for one hot shape.
+
+        The cached SQL is bound as a constant and the parameter tuple is
+        written out key by key, so a call skips the shape cache lookup and
+        _query_params' per-filter operator checks.
+        """
+        _, _, _, filter_shape, _, having_keys, _, has_limit, has_offset = shape
+        args = []
+        for key, _ in filter_shape:
+            if key.endswith("__isnull"):
+                continue
+            args.append(f"*f[{key!r}]" if key.endswith("__in") else f"f[{key!r}]")
+        args.extend(f"b.having_conditions[{key!r}]" for key in having_keys)
+        if has_limit:
+            args.append("b.limit_count")
+        if has_offset:
+            args.append("b.offset_count")
+        params = "(" + "".join(arg + ", " for arg in args) + ")"
+        source = (
+            "def run(db, b):\n"
+            "    f = b.filters\n"
+            f"    db.cur.execute(SQL, {params})\n"
+            "    return db._fetch_rows()\n"
+        )
+        namespace = {"SQL": sql}
+        exec(compile(source, f"<akron query {shape[0]}>", "exec"), namespace)
+        return namespace["run"]
+
+    def explain_cached(self, table_name: str, builder: QueryBuilder) -> Optional[str]:
+        """Return the cached SQL for the builder's shape, or None if not compiled yet."""
+        return self._query_cache.get(self._query_shape(table_name, builder))
+
+    def bulk_load(self, table_name: str, data_list: List[Dict[str, Any]],
+                  drop_indexes: bool = True, bulk_size: Optional[int] = None) -> List[int]:
+        """Bulk insert with the table's indexes dropped and rebuilt once; atomic under a savepoint."""
+        if not drop_indexes:
+            return self.bulk_insert(table_name, data_list, bulk_size)
+
+        tname = sanitize_identifier(table_name)
+        owns_transaction = not self.conn.in_transaction
         try:
-            self.cur.execute(sql, tuple(params))
+            if owns_transaction:
+                self.cur.execute("BEGIN IMMEDIATE")
+            with self._savepoint("bulk_load"):
+                # automatic indexes (UNIQUE/PRIMARY KEY constraints) have no SQL and stay
+                self.cur.execute(
+                    "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                    (tname,),
+                )
+                indexes = [(row[0], row[1]) for row in self.cur.fetchall()]
+                for name, _ in indexes:
+                    self.cur.execute(f'DROP INDEX "{name}"')
+                inserted_ids = self.bulk_insert(table_name, data_list, bulk_size)
+                for _, index_sql in indexes:
+                    self.cur.execute(index_sql)
+            if owns_transaction:
+                self.conn.commit()
+        except sqlite3.IntegrityError as e:
+            if owns_transaction:
+                self.conn.rollback()
+            msg = str(e)
+            if "UNIQUE constraint failed" in msg:
+                raise AkronError(f"Duplicate entry on unique field: {msg}")
+            raise AkronError(msg)
+        except (sqlite3.Error, AkronError) as e:
+            if owns_transaction and self.conn.in_transaction:
+                self.conn.rollback()
+            if isinstance(e, AkronError):
+                raise
+            raise AkronError(f"Bulk load failed: {str(e)}")
+        return inserted_ids
+
+    def query(self, table_name: str, builder: QueryBuilder) -> List[Dict[str, Any]]:
+        """
+        Execute advanced query with QueryBuilder.
+
+        Shapes run more than _HOT_THRESHOLD times are dispatched to a
+        generated function (see _specialize); the rest take the generic path.
+        """
+        shape = self._query_shape(table_name, builder)
+        try:
+            run = self._compiled.get(shape)
+            if run is not None:
+                return run(self, builder)
+
+            sql = self._compile_query(table_name, builder, shape)
+            hits = self._hit_count.get(shape, 0) + 1
+            self._hit_count[shape] = hits
+            if hits > self._HOT_THRESHOLD:
+                self._compiled[shape] = self._specialize(shape, sql)
+
+            self.cur.execute(sql, self._query_params(builder))
         except sqlite3.OperationalError as e:
             msg = str(e).lower()
             if "no such table" in msg:
                 raise TableNotFoundError(msg)
             raise AkronError(str(e))
         
-        columns = [d[0] for d in self.cur.description] if self.cur.description else []
-        rows = self.cur.fetchall()
-        return [dict(zip(columns, row)) for row in rows]
+        return self._fetch_rows()
+
+    def query_count(self, table_name: str, builder: QueryBuilder) -> int:
+        """Count the rows a QueryBuilder would return."""
+        sql = f"SELECT COUNT(*) FROM ({self._compile_query(table_name, builder)})"
+        try:
+            self.cur.execute(sql, self._query_params(builder))
+            result = self.cur.fetchone()
+            return result[0] if result else 0
+        except sqlite3.OperationalError as e:
+            msg = str(e).lower()
+            if "no such table" in msg:
+                raise TableNotFoundError(msg)
+            raise AkronError(str(e))
 
-    def bulk_update(self, table_name: str, updates: List[Dict[str, Any]]) -> int:
-        """Bulk update records. Each dict should have 'filters' and 'values' keys."""
+    @staticmethod
+    def _update_pairs(updates: List[Any]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Normalize bulk_update items ({'filters', 'values'} dicts or (filters, values) pairs)."""
         if not updates or not isinstance(updates, list):
             raise AkronError("updates must be a non-empty list")
-        
-        total_updated = 0
+        pairs = []
+        for update in updates:
+            if isinstance(update, dict) and "filters" in update and "values" in update:
+                pairs.append((update["filters"], update["values"]))
+            elif isinstance(update, tuple) and len(update) == 2:
+                pairs.append(update)
+            else:
+                raise AkronError("Each update must be a dict with 'filters' and 'values' keys "
+                                 "or a (filters, values) tuple")
+        return pairs
+
+    @staticmethod
+    def _batch_error(e: sqlite3.Error) -> AkronError:
+        """Translate a sqlite3 error from a batched write into the matching AkronError."""
+        msg = str(e)
+        if isinstance(e, sqlite3.IntegrityError) and "UNIQUE constraint failed" in msg:
+            return AkronError(f"Duplicate entry on unique field: {msg}")
+        if isinstance(e, sqlite3.OperationalError) and "no such table" in msg.lower():
+            return TableNotFoundError(msg.lower())
+        return AkronError(msg)
+
+    def _write_many(self, sql: str, param_rows: List[Tuple]) -> int:
+        """Run one statement over many parameter rows with executemany(), all or nothing."""
+        owns_transaction = not self.conn.in_transaction
+        scope = nullcontext() if owns_transaction else self._savepoint("bulk_write")
         try:
-            for update in updates:
-                if not isinstance(update, dict) or "filters" not in update or "values" not in update:
-                    raise AkronError("Each update must be a dict with 'filters' and 'values' keys")
-                
-                count = self.update(table_name, update["filters"], update["values"])
-                total_updated += count
-            
-        except Exception:
-            self.conn.rollback()
+            with scope:
+                self.cur.executemany(sql, param_rows)
+                changed = self.cur.rowcount
+        except sqlite3.Error as e:
+            if owns_transaction and self.conn.in_transaction:
+                self.conn.rollback()
+            raise self._batch_error(e)
+        if owns_transaction:
+            self.conn.commit()
+        return changed
+
+    def _write_each(self, write, items: List[Tuple]) -> int:
+        """Fallback for mixed shapes: call write(*item) per item, all or nothing."""
+        owns_transaction = not self.conn.in_transaction
+        if owns_transaction:
+            self.cur.execute("BEGIN")
+        scope = nullcontext() if owns_transaction else self._savepoint("bulk_write")
+        total = 0
+        try:
+            with scope:
+                for item in items:
+                    total += write(*item)
+        except Exception as e:
+            if owns_transaction and self.conn.in_transaction:
+                self.conn.rollback()
+            if isinstance(e, sqlite3.Error):
+                raise self._batch_error(e)
             raise
-        
-        return total_updated
+        if owns_transaction:
+            self.conn.commit()
+        return total
+
+    def bulk_update(self, table_name: str, updates: List[Any]) -> int:
+        """
+        Apply many updates in one transaction.
+
+        Each item is a {'filters': ..., 'values': ...} dict or a
+        (filters, values) tuple. When every item filters on the same columns
+        and sets the same columns, one UPDATE template is run through
+        executemany(); mixed shapes fall back to one update() per item.
+        """
+        pairs = self._update_pairs(updates)
+        for filters, new_values in pairs:
+            if not filters or not isinstance(filters, dict):
+                raise AkronError("filters must be a non-empty dict for update")
+            if not new_values or not isinstance(new_values, dict):
+                raise AkronError("new_values must be a non-empty dict for update")
+
+        filters, new_values = pairs[0]
+        filter_keys = tuple(sorted(filters))
+        set_keys = tuple(new_values)
+        if self._has_lookups(filters) or any(
+                tuple(sorted(f)) != filter_keys or tuple(v) != set_keys for f, v in pairs):
+            return self._write_each(lambda f, v: self.update(table_name, f, v), pairs)
+
+        tname = sanitize_identifier(table_name)
+        set_clause = ", ".join(f"{sanitize_identifier(k)} = ?" for k in set_keys)
+        where, _ = self._eq_where(filters)
+        sql = f"UPDATE {tname} SET {set_clause}{where}"
+        param_rows = [tuple(v[k] for k in set_keys) + tuple(f[k] for k in filter_keys)
+                      for f, v in pairs]
+        return self._write_many(sql, param_rows)
+
+    def bulk_delete(self, table_name: str, filters_list: List[Dict[str, Any]]) -> int:
+        """
+        Delete the rows matching each filters dict, in one transaction.
+
+        Same-shaped filters share one DELETE template run through
+        executemany(); mixed shapes fall back to one delete() per item.
+        """
+        if not filters_list or not isinstance(filters_list, list):
+            raise AkronError("filters_list must be a non-empty list")
+        for filters in filters_list:
+            if not filters or not isinstance(filters, dict):
+                raise AkronError("filters must be a non-empty dict for delete")
+
+        filter_keys = tuple(sorted(filters_list[0]))
+        if self._has_lookups(filters_list[0]) or any(
+                tuple(sorted(f)) != filter_keys for f in filters_list):
+            return self._write_each(lambda f: self.delete(table_name, f),
+                                    [(f,) for f in filters_list])
+
+        tname = sanitize_identifier(table_name)
+        where, _ = self._eq_where(filters_list[0])
+        sql = f"DELETE FROM {tname}{where}"
+        param_rows = [tuple(f[k] for k in filter_keys) for f in filters_list]
+        return self._write_many(sql, param_rows)
 
     def count(self, table_name: str, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count records matching filters."""
+        if self._has_lookups(filters):
+            return self.query_count(table_name, QueryBuilder().where(**filters))
         tname = sanitize_identifier(table_name)
         sql = f"SELECT COUNT(*) as count FROM {tname}"
-        params = []
+        params: Tuple = ()
         
         if filters:
-            conditions = []
-            for key, value in filters.items():
-                conditions.append(f"{sanitize_identifier(key)} = ?")
-                params.append(value)
-            sql += " WHERE " + " AND ".join(conditions)
+            where, params = self._eq_where(filters)
+            sql += where
         
         try:
-            self.cur.execute(sql, tuple(params))
+            self.cur.execute(sql, params)
             result = self.cur.fetchone()
             return result[0] if result else 0
         except sqlite3.OperationalError as e:
@@ -358,86 +901,222 @@ class SQLiteDriver(BaseDriver):
                 raise TableNotFoundError(msg)
             raise AkronError(str(e))
 
+    def count_many(self, specs: Dict[str, Tuple[str, Optional[Dict[str, Any]]]]) -> Dict[str, int]:
+        """
+        Run several counts in one statement.
+
+        specs maps a result name to (table_name, filters); each becomes a
+        scalar subquery of a single SELECT, so N counts cost one round trip.
+        """
+        if not specs or not isinstance(specs, dict):
+            raise AkronError("specs must be a non-empty dict of name -> (table_name, filters)")
+        subqueries = []
+        params: List[Any] = []
+        for table_name, filters in specs.values():
+            if self._has_lookups(filters):
+                builder = QueryBuilder().where(**filters)
+                subqueries.append(f"(SELECT COUNT(*) FROM ({self._compile_query(table_name, builder)}))")
+                params.extend(self._query_params(builder))
+                continue
+            sub = f"(SELECT COUNT(*) FROM {sanitize_identifier(table_name)}"
+            if filters:
+                where, where_params = self._eq_where(filters)
+                sub += where
+                params.extend(where_params)
+            subqueries.append(sub + ")")
+
+        sql = "SELECT " + ", ".join(subqueries)
+        try:
+            self.cur.execute(sql, params)
+            row = self.cur.fetchone()
+        except sqlite3.OperationalError as e:
+            msg = str(e).lower()
+            if "no such table" in msg:
+                raise TableNotFoundError(msg)
+            raise AkronError(str(e))
+        return dict(zip(specs, row))
+
+    def exists(self, table_name: str, filters: Dict[str, Any]) -> bool:
+        """Check for a matching record without counting every match."""
+        if self._has_lookups(filters):
+            return bool(self.query(table_name, QueryBuilder().where(**filters).limit(1)))
+        tname = sanitize_identifier(table_name)
+        sql = f"SELECT 1 FROM {tname}"
+        params: Tuple = ()
+        if filters:
+            where, params = self._eq_where(filters)
+            sql += where
+        sql += " LIMIT 1"
+        try:
+            self.cur.execute(sql, params)
+            return self.cur.fetchone() is not None
+        except sqlite3.OperationalError as e:
+            msg = str(e).lower()
+            if "no such table" in msg:
+                raise TableNotFoundError(msg)
+            raise AkronError(str(e))
+
+    def _aggregate_expr(self, func_spec: str, prefix: str = "") -> str:
+        """Translate 'count', 'count(col)' or 'sum(col)' into a safe SQL expression."""
+        func, column = parse_aggregate(func_spec)
+        if column is None:
+            return "COUNT(*)"
+        return f"{func.upper()}({prefix}{column})"
+
     def aggregate(self, table_name: str, aggregations: Dict[str, str], 
                   filters: Optional[Dict[str, Any]] = None, 
                   group_by: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        """Perform aggregations like sum, count, avg, min, max."""
+        """
+        Perform aggregations like sum, count, avg, min, max in a single query.
+
+        Aggregations map an alias to 'count' or 'func(column)'. Filters on
+        table columns become the WHERE clause (applied before grouping);
+        filters on an aggregation alias, e.g. total__gt=100, become HAVING.
+        """
+        if not aggregations or not isinstance(aggregations, dict):
+            raise AkronError("aggregations must be a non-empty dict")
         tname = sanitize_identifier(table_name)
         
         # Build SELECT clause with aggregations
-        agg_fields = []
-        for alias, func_spec in aggregations.items():
-            if func_spec.lower() == "count":
-                agg_fields.append(f"COUNT(*) as {alias}")
-            else:
-                # Handle functions like sum(column), avg(column)
-                if "(" in func_spec:
-                    # Already formatted like "sum(amount)"
-                    agg_fields.append(f"{func_spec.upper()} as {alias}")
-                else:
-                    # Assume it's "sum" and we need to figure out the column
-                    # For now, default to * for count, but this needs improvement
-                    if func_spec.lower() in ["sum", "avg", "min", "max"]:
-                        # This is a simplification - in real usage, column should be specified
-                        agg_fields.append(f"{func_spec.upper()}(*) as {alias}")
-                    else:
-                        agg_fields.append(f"{func_spec} as {alias}")
-        
-        select_clause = ", ".join(agg_fields)
+        agg_fields = [
+            f"{self._aggregate_expr(func_spec)} as {sanitize_identifier(alias)}"
+            for alias, func_spec in aggregations.items()
+        ]
+        group_fields = ", ".join(sanitize_identifier(f) for f in group_by) if group_by else ""
+        select_clause = ", ".join(([group_fields] if group_fields else []) + agg_fields)
         sql = f"SELECT {select_clause} FROM {tname}"
-        params = []
         
-        # Add WHERE clause
-        if filters:
-            conditions = []
-            for key, value in filters.items():
-                conditions.append(f"{sanitize_identifier(key)} = ?")
-                params.append(value)
-            sql += " WHERE " + " AND ".join(conditions)
+        # Split filters: column predicates are pushed below the GROUP BY,
+        # predicates on aggregate aliases go to HAVING
+        where_conditions, having_conditions = [], []
+        where_params, having_params = [], []
+        for key, value in (filters or {}).items():
+            condition, values = self._condition(key, value)
+            if key.split("__", 1)[0] in aggregations:
+                having_conditions.append(condition)
+                having_params.extend(values)
+            else:
+                where_conditions.append(condition)
+                where_params.extend(values)
         
-        # Add GROUP BY clause
-        if group_by:
-            group_fields = ", ".join(sanitize_identifier(f) for f in group_by)
-            sql += f" GROUP BY {group_fields}"
-            # Add group by fields to select
-            sql = f"SELECT {group_fields}, {select_clause} FROM {tname}"
-            if filters:
-                sql += " WHERE " + " AND ".join(conditions)
+        if where_conditions:
+            sql += " WHERE " + " AND ".join(where_conditions)
+        if group_fields:
             sql += f" GROUP BY {group_fields}"
+        if having_conditions:
+            sql += " HAVING " + " AND ".join(having_conditions)
         
         try:
-            self.cur.execute(sql, tuple(params))
+            self.cur.execute(sql, tuple(where_params + having_params))
         except sqlite3.OperationalError as e:
             msg = str(e).lower()
             if "no such table" in msg:
                 raise TableNotFoundError(msg)
             raise AkronError(str(e))
         
+        columns = [d[0] for d in self.cur.description] if self.cur.description else []
+        if not group_fields and not having_conditions:
+            # Without GROUP BY SQLite always returns exactly one row
+            return [dict(zip(columns, self.cur.fetchone()))]
+        rows = self.cur.fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def join_aggregate(self, left_table: str, right_table: str, on: Tuple[str, str],
+                       aggregations: Dict[str, str],
+                       group_by: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Aggregate right_table rows per left_table group with one LEFT JOIN ... GROUP BY.
+
+        SQLite evaluates the join and the aggregates itself, so this is the
+        preferred path; BaseDriver provides an in-process hash join for
+        backends that cannot push it down.
+        """
+        if not aggregations or not isinstance(aggregations, dict):
+            raise AkronError("aggregations must be a non-empty dict")
+        left_key, right_key = (sanitize_identifier(c) for c in on)
+        lname = sanitize_identifier(left_table)
+        rname = sanitize_identifier(right_table)
+        group_fields = ", ".join(f"l.{sanitize_identifier(c)}" for c in (group_by or [left_key]))
+
+        agg_fields = []
+        for alias, func_spec in aggregations.items():
+            func, column = parse_aggregate(func_spec)
+            # count only matched right rows, so unmatched left rows report 0
+            expr = f"{func.upper()}(r.{right_key if column is None else column})"
+            agg_fields.append(f"{expr} as {sanitize_identifier(alias)}")
+
+        sql = (
+            f"SELECT {group_fields}, {', '.join(agg_fields)} "
+            f"FROM {lname} l LEFT JOIN {rname} r ON l.{left_key} = r.{right_key} "
+            f"GROUP BY {group_fields}"
+        )
+        try:
+            self.cur.execute(sql)
+        except sqlite3.OperationalError as e:
+            msg = str(e).lower()
+            if "no such table" in msg:
+                raise TableNotFoundError(msg)
+            raise AkronError(str(e))
+
         columns = [d[0] for d in self.cur.description] if self.cur.description else []
         rows = self.cur.fetchall()
         return [dict(zip(columns, row)) for row in rows]
 
     def raw_sql(self, sql: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """Execute raw SQL query."""
+        return list(self.raw_iter(sql, params))
+
+    def raw_iter(self, sql: str, params: Optional[tuple] = None, chunk: int = 1000) -> Iterator[Any]:
+        """Execute raw SQL now; iterate SELECT rows ``chunk`` at a time, or one {"affected_rows": n} row."""
+        if not isinstance(chunk, int) or chunk < 1:
+            raise AkronError("chunk must be a positive integer")
         try:
-            if params:
-                self.cur.execute(sql, params)
-            else:
-                self.cur.execute(sql)
-            
             # Check if it's a SELECT query
             if sql.strip().upper().startswith("SELECT"):
-                columns = [d[0] for d in self.cur.description] if self.cur.description else []
-                rows = self.cur.fetchall()
-                return [dict(zip(columns, row)) for row in rows]
-            else:
-                # For INSERT/UPDATE/DELETE, commit and return affected rows info
-                self.conn.commit()
-                return [{"affected_rows": self.cur.rowcount}]
-        
+                cur = self.conn.execute(sql, params or ())
+                cur.arraysize = chunk
+                return self._iter_rows(cur)
+            self._write(sql, params or ())
+            return iter([{"affected_rows": self.cur.rowcount}])
+        except sqlite3.Error as e:
+            raise AkronError(f"SQL execution error: {str(e)}")
+
+    def _iter_rows(self, cur: sqlite3.Cursor) -> Iterator[Any]:
+        """Yield the rows of an executed cursor, one fetchmany() batch at a time."""
+        try:
+            batch = cur.fetchmany()
+            while batch:
+                if self.dict_rows:
+                    batch = [dict(row) for row in batch]
+                yield from batch
+                batch = cur.fetchmany()
         except sqlite3.Error as e:
             raise AkronError(f"SQL execution error: {str(e)}")
 
+    def pragma(self, name: str, value: Any = None) -> List[Dict[str, Any]]:
+        """
+        Read or set a SQLite PRAGMA.
+
+        Schema changes made through PRAGMAs are safe for cached statements:
+        SQLite re-prepares them automatically when the schema version moves.
+        """
+        pname = sanitize_identifier(name)
+        sql = f"PRAGMA {pname}"
+        if value is not None:
+            if isinstance(value, bool):
+                value = int(value)
+            if isinstance(value, (int, float)):
+                sql += f" = {value}"
+            else:
+                sql += f" = {sanitize_identifier(str(value))}"
+        try:
+            self.cur.execute(sql)
+        except sqlite3.Error as e:
+            raise AkronError(f"PRAGMA {pname} failed: {str(e)}")
+        columns = [d[0] for d in self.cur.description] if self.cur.description else []
+        rows = self.cur.fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
     def begin_transaction(self) -> None:
         """Begin a transaction."""
         self.cur.execute("BEGIN TRANSACTION")
@@ -450,8 +1129,14 @@ class SQLiteDriver(BaseDriver):
         """Rollback the current transaction."""
         self.conn.rollback()
 
-    def create_index(self, table_name: str, columns: List[str], unique: bool = False) -> None:
-        """Create an index on the specified columns."""
+    @contextmanager
+    def nested_transaction(self):
+        """Run a nested transaction as a SAVEPOINT inside the open one."""
+        with self._savepoint("akron_nested"):
+            yield
+
+    def _index_sql(self, table_name: str, columns: List[str], unique: bool = False) -> str:
+        """Build the CREATE INDEX statement for the given columns."""
         tname = sanitize_identifier(table_name)
         cols = [sanitize_identifier(col) for col in columns]
         cols_str = ", ".join(cols)
@@ -461,24 +1146,18 @@ class SQLiteDriver(BaseDriver):
         index_name = sanitize_identifier(index_name)
         
         unique_str = "UNIQUE " if unique else ""
-        sql = f"CREATE {unique_str}INDEX IF NOT EXISTS {index_name} ON {tname} ({cols_str})"
-        
-        try:
-            self.cur.execute(sql)
-            self.conn.commit()
-        except sqlite3.OperationalError as e:
-            raise AkronError(f"Failed to create index: {str(e)}")
+        return f"CREATE {unique_str}INDEX IF NOT EXISTS {index_name} ON {tname} ({cols_str})"
+
+    def create_index(self, table_name: str, columns: List[str], unique: bool = False) -> None:
+        """Create an index on the specified columns."""
+        sql = self._index_sql(table_name, columns, unique)
+        self._exec_script(sql, "Failed to create index: ")
 
     def drop_index(self, index_name: str) -> None:
         """Drop an index."""
         index_name = sanitize_identifier(index_name)
         sql = f"DROP INDEX IF EXISTS {index_name}"
-        
-        try:
-            self.cur.execute(sql)
-            self.conn.commit()
-        except sqlite3.OperationalError as e:
-            raise AkronError(f"Failed to drop index: {str(e)}")
+        self._exec_script(sql, "Failed to drop index: ")
 
     def close(self):
         try:
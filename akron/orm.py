@@ -1,12 +1,18 @@
 
 """User-facing entry point for Akron."""
 
+import json
 from contextlib import contextmanager
-from typing import Dict, Optional, Any, List, Union
+from typing import Dict, Iterator, Optional, Any, List, Tuple, Union
 from .core.sqlite_driver import SQLiteDriver
 from .core.base import QueryBuilder
 from .exceptions import UnsupportedDriverError, AkronError
 
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install akron[fast]
+    orjson = None
+
 
 class Akron:
     """
@@ -27,7 +33,7 @@ class Akron:
         count = db.count("users", {"active": True})
         
         # Aggregations
-        stats = db.aggregate("orders", {"total": "sum", "count": "count"}, group_by=["user_id"])
+        stats = db.aggregate("orders", {"total": "sum(amount)", "count": "count"}, group_by=["user_id"])
         
         # Transactions
         with db.transaction():
@@ -41,15 +47,39 @@ class Akron:
         results = db.raw("SELECT * FROM users WHERE age > ?", (18,))
     """
 
-    def __init__(self, db_url: str = "sqlite:///akron.db"):
+    def __init__(self, db_url: str = "sqlite:///akron.db", stmt_cache_size: int = 128,
+                 dict_rows: bool = False, fast: bool = False):
+        """
+        Open a connection for the given database URL.
+        
+        stmt_cache_size is the number of prepared statements kept per
+        connection (SQLite only); repeated queries reuse them instead of
+        re-parsing the SQL.
+        
+        With SQLite, find/query/raw return sqlite3.Row objects, which support
+        row["column"], keys() and dict(row) without building a dict per row.
+        Pass dict_rows=True to get plain dicts as in earlier versions.
+        
+        fast=True (SQLite only) applies PRAGMA journal_mode=WAL and
+        synchronous=NORMAL: commits skip the per-transaction fsync, at the
+        cost of possibly losing the most recent commits on power failure.
+        It also sets temp_store=MEMORY, a 64 MiB page cache and a 256 MiB
+        mmap_size, trading memory for fewer disk reads.
+        Pair it with db.transaction() around bulk work so many writes share
+        a single COMMIT.
+        """
         self.db_url = db_url
+        self.stmt_cache_size = stmt_cache_size
+        self.dict_rows = dict_rows
+        self.fast = fast
         self.driver = self._choose_driver(db_url)
         self._in_transaction = False
 
     def _choose_driver(self, url: str):
         url = url.strip()
         if url.startswith("sqlite://"):
-            return SQLiteDriver(url)
+            return SQLiteDriver(url, stmt_cache_size=self.stmt_cache_size,
+                                dict_rows=self.dict_rows, fast=self.fast)
         elif url.startswith("mysql://"):
             from .core.mysql_driver import MySQLDriver
             return MySQLDriver(url)
@@ -67,13 +97,51 @@ class Akron:
         """Create a table with the given schema."""
         return self.driver.create_table(table_name, schema)
 
+    def create_schema(self, tables: Dict[str, Dict[str, str]],
+                      indexes: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Create several tables and their indexes in one batch.
+        
+        Examples:
+            db.create_schema(
+                {"users": {"id": "int", "email": "str"},
+                 "posts": {"id": "int", "user_id": "int->users.id"}},
+                [{"table": "users", "columns": "email", "unique": True},
+                 {"table": "posts", "columns": ["user_id"]}]
+            )
+        """
+        return self.driver.create_schema(tables, indexes)
+
     def insert(self, table_name: str, data: Dict[str, Any]) -> int:
         """Insert a single record and return the ID."""
         return self.driver.insert(table_name, data)
         
-    def bulk_insert(self, table_name: str, data_list: List[Dict[str, Any]]) -> List[int]:
-        """Insert multiple records efficiently."""
-        return self.driver.bulk_insert(table_name, data_list)
+    def bulk_insert(self, table_name: str, data_list: List[Dict[str, Any]],
+                    bulk_size: Optional[int] = None, commit_size: Optional[int] = None) -> List[int]:
+        """
+        Insert multiple records efficiently.
+        
+        bulk_size limits the rows sent per batch and commit_size the rows
+        written per transaction; by default everything goes in one batch.
+        """
+        return self.driver.bulk_insert(table_name, data_list, bulk_size, commit_size)
+
+    def bulk_load(self, table_name: str, data_list: List[Dict[str, Any]],
+                  drop_indexes: bool = True, bulk_size: Optional[int] = None) -> List[int]:
+        """
+        Load a large seed of records into a table.
+        
+        With drop_indexes=True (SQLite) the table's indexes are dropped before
+        the load and rebuilt once afterwards, which is much cheaper than
+        updating every index row by row. The load is atomic, also inside
+        db.transaction(): on failure no rows are kept and every dropped
+        index is restored.
+        
+        Examples:
+            db.bulk_load("events", rows)                      # rebuild indexes after load
+            db.bulk_load("events", rows, drop_indexes=False)  # same as bulk_insert
+        """
+        return self.driver.bulk_load(table_name, data_list, drop_indexes, bulk_size)
 
     def find(self, table_name: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Find records with simple filters."""
@@ -88,10 +156,18 @@ class Akron:
         """Update records matching filters."""
         return self.driver.update(table_name, filters, new_values)
         
-    def bulk_update(self, table_name: str, updates: List[Dict[str, Any]]) -> int:
-        """Bulk update records. Each dict should include 'filters' and 'values' keys."""
+    def bulk_update(self, table_name: str, updates: List[Any]) -> int:
+        """
+        Bulk update records. Each item is a dict with 'filters' and 'values'
+        keys or a (filters, values) tuple; same-shaped items run as one
+        batched statement.
+        """
         return self.driver.bulk_update(table_name, updates)
 
+    def bulk_delete(self, table_name: str, filters_list: List[Dict[str, Any]]) -> int:
+        """Delete the records matching each filters dict; same-shaped filters run as one batched statement."""
+        return self.driver.bulk_delete(table_name, filters_list)
+
     def delete(self, table_name: str, filters: Dict[str, Any]) -> int:
         """Delete records matching filters."""
         return self.driver.delete(table_name, filters)
@@ -100,6 +176,14 @@ class Akron:
         """Count records matching filters."""
         return self.driver.count(table_name, filters)
 
+    def count_many(self, specs: Dict[str, Tuple[str, Optional[Dict[str, Any]]]]) -> Dict[str, int]:
+        """
+        Count several tables/filters in one database call.
+
+        specs maps a result name to (table_name, filters); returns name -> count.
+        """
+        return self.driver.count_many(specs)
+
     # ===== ADVANCED QUERYING =====
     
     def query(self, table_name: str) -> 'QueryBuilder':
@@ -118,39 +202,84 @@ class Akron:
             return results[0] if results else None
             
         def count():
-            # For count, we need to modify the query
-            original_select = builder.select_fields
-            builder.select_fields = ['COUNT(*) as count']
-            results = self.driver.query(table_name, builder)
-            builder.select_fields = original_select  # restore
-            return results[0]['count'] if results else 0
+            return self.driver.query_count(table_name, builder)
+        
+        def explain_cached():
+            # SQL compiled for this builder's shape, or None if not run yet
+            return self.driver.explain_cached(table_name, builder)
             
         builder.all = all
         builder.first = first
         builder.count = count
+        builder.explain_cached = explain_cached
         return builder
 
     def aggregate(self, table_name: str, aggregations: Dict[str, str], 
                   filters: Optional[Dict[str, Any]] = None, 
                   group_by: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
-        Perform aggregations.
+        Perform aggregations in a single SQL query.
+        
+        Supported aggregates are sum, avg, count, min and max, written as
+        "func(column)" ("count" alone counts rows). Filters on columns are
+        applied before grouping; filters on an aggregate alias (e.g.
+        total__gt=100) are applied to the groups via HAVING.
         
         Examples:
             # Count and sum by group
-            db.aggregate("orders", {"total": "sum", "count": "count"}, group_by=["user_id"])
+            db.aggregate("orders", {"total": "sum(amount)", "count": "count"}, group_by=["user_id"])
             
             # Average age of active users
-            db.aggregate("users", {"avg_age": "avg"}, filters={"active": True})
+            db.aggregate("users", {"avg_age": "avg(age)"}, filters={"active": True})
+            
+            # Only users who spent more than 100
+            db.aggregate("orders", {"total": "sum(amount)"}, filters={"total__gt": 100}, group_by=["user_id"])
         """
         return self.driver.aggregate(table_name, aggregations, filters, group_by)
 
+    def join_aggregate(self, left_table: str, right_table: str, on: Tuple[str, str],
+                       aggregations: Dict[str, str],
+                       group_by: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Aggregate related rows per parent row (LEFT JOIN ... GROUP BY).
+        
+        `on` is a (left_column, right_column) pair and the aggregations use
+        the same specs as aggregate(), applied to right_table columns.
+        Left rows without matches get count 0 and None for the others.
+        SQLite runs this as a single SQL join (the preferred path); other
+        backends fall back to an in-process hash join.
+        
+        Examples:
+            # Post count and average views per user
+            db.join_aggregate("users", "posts", ("id", "user_id"),
+                              {"post_count": "count", "avg_views": "avg(views)"},
+                              group_by=["id", "name"])
+        """
+        return self.driver.join_aggregate(left_table, right_table, on, aggregations, group_by)
+
     # ===== RAW SQL =====
     
     def raw(self, sql: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """Execute raw SQL query."""
         return self.driver.raw_sql(sql, params)
 
+    def raw_iter(self, sql: str, params: Optional[tuple] = None, chunk: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Execute raw SQL and iterate over the rows as they are fetched,
+        ``chunk`` rows at a time, instead of building the whole result list.
+        """
+        return self.driver.raw_iter(sql, params, chunk)
+
+    def pragma(self, name: str, value: Any = None) -> List[Dict[str, Any]]:
+        """
+        Read or set a database PRAGMA (SQLite only).
+        
+        Examples:
+            db.pragma("journal_mode", "WAL")
+            db.pragma("synchronous")  # without a value the current setting is returned
+        """
+        return self.driver.pragma(name, value)
+
     # ===== TRANSACTIONS =====
     
     @contextmanager
@@ -162,10 +291,13 @@ class Akron:
             with db.transaction():
                 db.insert("users", {"name": "Alice"})
                 db.insert("posts", {"title": "Hello World", "user_id": 1})
+
+        A nested transaction() runs as a SAVEPOINT on SQLite: an error undoes
+        only the nested block, and the outer transaction carries on.
         """
         if self._in_transaction:
-            # Nested transactions - just pass through
-            yield self
+            with self.driver.nested_transaction():
+                yield self
             return
             
         self._in_transaction = True
@@ -216,48 +348,61 @@ class Akron:
     # ===== SERIALIZATION =====
     
     def to_dict(self, records: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
-        """Convert records to plain dictionaries (already are, but for consistency)."""
-        return records
+        """Convert records (e.g. sqlite3.Row results) to plain dictionaries."""
+        return self._plain_records(records)
         
     def to_json(self, records: Union[Dict[str, Any], List[Dict[str, Any]]]) -> str:
-        """Convert records to JSON string."""
-        import json
-        return json.dumps(records, default=str)
+        """Convert records to JSON string (uses orjson when installed)."""
+        if orjson is not None:
+            return self.to_json_bytes(records).decode()
+        return json.dumps(self._plain_records(records), default=str)
+        
+    def to_json_bytes(self, records: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bytes:
+        """Convert records to UTF-8 encoded JSON, skipping the str round-trip."""
+        records = self._plain_records(records)
+        if orjson is not None:
+            return orjson.dumps(records, default=str,
+                                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(records, default=str).encode()
+        
+    @staticmethod
+    def _plain_records(records: Any) -> Any:
+        # Row objects (e.g. sqlite3.Row) are converted to dicts once, up front
+        if isinstance(records, list):
+            if records and not isinstance(records[0], dict) and hasattr(records[0], "keys"):
+                return [dict(r) for r in records]
+            return records
+        if not isinstance(records, dict) and hasattr(records, "keys"):
+            return dict(records)
+        return records
 
     # ===== CONVENIENCE METHODS =====
     
     def exists(self, table_name: str, filters: Dict[str, Any]) -> bool:
         """Check if any record exists matching filters."""
-        return self.count(table_name, filters) > 0
+        return self.driver.exists(table_name, filters)
         
     def get_or_create(self, table_name: str, filters: Dict[str, Any], 
                       defaults: Optional[Dict[str, Any]] = None) -> tuple[Dict[str, Any], bool]:
         """
         Get existing record or create new one.
         Returns (record, created) tuple.
-        """
-        record = self.find_one(table_name, filters)
-        if record:
-            return record, False
         
-        # Create new record
-        create_data = {**filters}
-        if defaults:
-            create_data.update(defaults)
-        
-        record_id = self.insert(table_name, create_data)
-        new_record = self.find_one(table_name, {"id": record_id})
-        return new_record, True
+        On SQLite, when the filter columns have a UNIQUE index this is a single
+        INSERT ... ON CONFLICT DO NOTHING RETURNING *, plus one SELECT only if
+        the record already existed. Because it always attempts the INSERT,
+        even a "get" hit takes the database write lock.
+        """
+        return self.driver.get_or_create(table_name, filters, defaults)
         
     def upsert(self, table_name: str, filters: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
-        """Update existing record or insert new one."""
-        if self.exists(table_name, filters):
-            self.update(table_name, filters, values)
-            return self.find_one(table_name, filters)
-        else:
-            create_data = {**filters, **values}
-            record_id = self.insert(table_name, create_data)
-            return self.find_one(table_name, {"id": record_id})
+        """
+        Update existing record or insert new one.
+        
+        On SQLite, when the filter columns have a UNIQUE index this runs as one
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING * statement.
+        """
+        return self.driver.upsert(table_name, filters, values)
 
     def close(self):
         """Close database connection."""
@@ -1,6 +1,8 @@
 """Utility helpers for Akron."""
 
-from typing import Any
+from typing import Any, Optional, Tuple
+
+from .exceptions import AkronError
 
 _TYPE_MAP = {
     "int": "INTEGER",
@@ -29,6 +31,25 @@ def map_type(dtype: Any) -> str:
     return "TEXT"
 
 
+def parse_type_spec(dtype: Any) -> Tuple[Any, Optional[Tuple[str, str]]]:
+    """Split a column spec into its base type and optional foreign key.
+
+    'int' -> ('int', None); 'int->users.id' -> ('int', ('users', 'id')).
+    A single left-to-right scan with str.partition: the base type up to '->',
+    then the table up to '.', then the column. Non-string specs (python
+    types) are returned unchanged.
+    """
+    if not isinstance(dtype, str):
+        return dtype, None
+    base_type, arrow, ref = dtype.partition("->")
+    if not arrow:
+        return dtype, None
+    ref_table, dot, ref_col = ref.strip().partition(".")
+    if not dot:
+        raise AkronError(f"Invalid foreign key spec '{dtype}', expected 'type->table.column'")
+    return base_type.strip(), (sanitize_identifier(ref_table), sanitize_identifier(ref_col))
+
+
 def sanitize_identifier(name: str) -> str:
     """Very small sanitizer for identifiers (table/column names).
 
@@ -46,3 +67,30 @@ def sanitize_identifier(name: str) -> str:
         if not (ch.isalnum() or ch == "_"):
             raise ValueError(f"invalid character in identifier: {ch}")
     return name
+
+
+# Aggregate functions Akron accepts; anything else is rejected
+AGGREGATES = ("sum", "avg", "count", "min", "max")
+
+
+def parse_aggregate(func_spec: str) -> Tuple[str, Optional[str]]:
+    """Split an aggregate spec like 'sum(amount)' into ('sum', 'amount').
+
+    'count' (or 'count(*)') returns ('count', None). The function must be in
+    AGGREGATES and the column must be a valid identifier.
+    """
+    spec = str(func_spec).strip()
+    func, paren, rest = spec.partition("(")
+    func = func.strip().lower()
+    if func not in AGGREGATES:
+        raise AkronError(f"Unsupported aggregate '{func_spec}'; use one of: {', '.join(AGGREGATES)}")
+    if not paren:
+        if func != "count":
+            raise AkronError(f"Aggregate '{func_spec}' needs a column, e.g. '{func}(amount)'")
+        return func, None
+    if not rest.endswith(")"):
+        raise AkronError(f"Malformed aggregate '{func_spec}'")
+    column = rest[:-1].strip()
+    if column == "*" and func == "count":
+        return func, None
+    return func, sanitize_identifier(column)
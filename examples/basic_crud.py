@@ -15,21 +15,21 @@ def run_example():
 
     # 3. Read all
     all_users = db.find("users")
-    print("all users:", all_users)
+    print("all users:", db.to_dict(all_users))
 
     # 4. Filtered read
     young = db.find("users", {"age": 25})
-    print("age=25:", young)
+    print("age=25:", db.to_dict(young))
 
     # 5. Update
     updated = db.update("users", {"id": alice_id}, {"age": 31})
     print("rows updated:", updated)
-    print("after update:", db.find("users", {"id": alice_id}))
+    print("after update:", db.to_dict(db.find("users", {"id": alice_id})))
 
     # 6. Delete
     deleted = db.delete("users", {"id": bob_id})
     print("rows deleted:", deleted)
-    print("final:", db.find("users"))
+    print("final:", db.to_dict(db.find("users")))
 
     db.close()
 
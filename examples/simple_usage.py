@@ -22,24 +22,19 @@ db.create_table("posts", {
     "title": "str",
     "content": "str",
     "user_id": "int->users.id",  # Foreign key to users table
+    "views": "int",
     "published": "bool"
 })
 
 # ===== BASIC OPERATIONS =====
 
-# Insert single record
-user_id = db.insert("users", {
-    "name": "John Doe",
-    "email": "john@example.com", 
-    "age": 30,
-    "active": True
-})
-
-# Insert multiple records at once
+# Insert multiple records at once (one prepared statement for all rows)
 user_ids = db.bulk_insert("users", [
+    {"name": "John Doe", "email": "john@example.com", "age": 30, "active": True},
     {"name": "Alice", "email": "alice@example.com", "age": 25, "active": True},
     {"name": "Bob", "email": "bob@example.com", "age": 35, "active": False}
 ])
+user_id = user_ids[0]
 
 # Find all records
 all_users = db.find("users")
@@ -53,8 +48,16 @@ john = db.find_one("users", {"name": "John Doe"})
 # Update records
 db.update("users", {"name": "John Doe"}, {"age": 31})
 
+# Update or delete many records: prefer one bulk call over a Python loop of
+# update()/delete(); same-shaped items run as a single batched statement
+db.bulk_update("users", [
+    ({"email": "john@example.com"}, {"age": 31}),
+    ({"email": "alice@example.com"}, {"age": 26}),
+])
+
 # Delete records
 db.delete("users", {"active": False})
+db.bulk_delete("users", [{"email": "old1@example.com"}, {"email": "old2@example.com"}])
 
 # Count records
 total_users = db.count("users")
@@ -87,7 +90,7 @@ post_count = db.query("posts").where(published=True).count()
 
 # Group by aggregations
 stats_by_user = db.aggregate("posts", 
-    {"post_count": "count", "avg_views": "avg"}, 
+    {"post_count": "count", "avg_views": "avg(views)"}, 
     group_by=["user_id"]
 )
 
@@ -95,7 +98,7 @@ stats_by_user = db.aggregate("posts",
 
 # Automatic transaction management
 with db.transaction():
-    user_id = db.insert("users", {"name": "Alice", "email": "alice@example.com"})
+    user_id = db.insert("users", {"name": "Carol", "email": "carol@example.com"})
     db.insert("posts", {"title": "Hello World", "user_id": user_id, "published": True})
     # If any operation fails, everything rolls back automatically
 
@@ -10,8 +10,8 @@ def run_example():
     bob_id = db.insert("users", {"name": "Bob"})
     db.insert("orders", {"user_id": alice_id, "amount": 100.0})
     db.insert("orders", {"user_id": bob_id, "amount": 50.0})
-    print("Users:", db.find("users"))
-    print("Orders:", db.find("orders"))
+    print("Users:", db.to_dict(db.find("users")))
+    print("Orders:", db.to_dict(db.find("orders")))
     db.close()
 
 if __name__ == "__main__":
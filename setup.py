@@ -20,6 +20,10 @@ setup(
         "psycopg2",
         "pymongo"
     ],
+    extras_require={
+        "fast": ["orjson"],
+        "numba": ["numba", "numpy"]
+    },
     entry_points={
         "console_scripts": [
             "akron=akron.cli:main"
@@ -0,0 +1,51 @@
+"""SQLite driver tests."""
+
+import pytest
+
+from akron import Akron
+
+
+def _seed(db):
+    db.create_table("posts", {"id": "int", "title": "str", "views": "int", "grp": "int", "note": "str"})
+    db.bulk_insert("posts", [
+        {"title": f"post {i}", "views": (i * 37) % 101, "grp": i % 4, "note": None if i % 3 else "x"}
+        for i in range(60)
+    ])
+
+
+@pytest.fixture
+def dbs():
+    hot, cold = Akron("sqlite:///:memory:"), Akron("sqlite:///:memory:")
+    _seed(hot)
+    _seed(cold)
+    # the cold driver never specializes, so it always takes the generic path
+    cold.driver._HOT_THRESHOLD = float("inf")
+    yield hot, cold
+    hot.close()
+    cold.close()
+
+
+SHAPES = [
+    # __in expansion, equality and LIMIT/OFFSET binding order
+    lambda db, n: db.query("posts").where(id__in=list(range(n, n + 20)), grp__ne=n % 4).order_by("-views", "id").limit(4).offset(1 + n % 3),
+    # __isnull binds no parameter, between two that do
+    lambda db, n: db.query("posts").where(views__gt=n, note__isnull=True, title__like="post %").order_by("id").limit(5),
+    lambda db, n: db.query("posts").where(views__gt=n, note__isnull=False, grp__in=[n % 4]).order_by("-id"),
+    lambda db, n: db.query("posts").where(views__gte=n, views__lte=n + 40, grp__ne=n % 4).order_by("views", "-id"),
+    # HAVING values come after the WHERE parameters
+    lambda db, n: db.query("posts").select("grp").where(views__lt=n + 50).group_by("grp").having(grp=n % 4),
+]
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_hot_query_specialization_matches_generic_path(dbs, shape):
+    hot, cold = dbs
+    runs = hot.driver._HOT_THRESHOLD + 8
+    matched = 0
+    for n in range(runs):
+        expected = [tuple(row) for row in shape(cold, n).all()]
+        assert [tuple(row) for row in shape(hot, n).all()] == expected
+        matched += bool(expected)
+    assert matched > runs // 2
+    assert len(hot.driver._compiled) == 1
+    assert not cold.driver._compiled